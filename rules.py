@@ -0,0 +1,113 @@
+# backend/rules.py
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Tuple
+
+RULES_PATH = Path(__file__).resolve().with_name("fallback_rules.json")
+
+_LIST_FIELDS = ("Preconditions", "Steps")
+_TEXT_FIELDS = ("Title", "Objective", "Expected_Result")
+
+
+def _compile_alternation(patterns: List[str], overlapping: bool = False) -> "re.Pattern":
+    """
+    Compile lowercase patterns into one unanchored alternation with a named
+    group (k0, k1, ...) per pattern; callers scan lowercased text once with
+    finditer(). With overlapping=True each branch is a lookahead, so every
+    pattern is reported even inside another match; only patterns starting
+    at the same position shadow later ones, so spell shared keywords the
+    same way in the config.
+    """
+    branch = "(?=(?P<k{}>{}))" if overlapping else "(?P<k{}>{})"
+    return re.compile("|".join(branch.format(i, p) for i, p in enumerate(patterns)) or "(?!)")
+
+
+def _freeze_testcases(testcases: List[Dict[str, Any]]) -> Tuple[MappingProxyType, ...]:
+    """
+    Normalize config test cases once (sequential IDs, auto-filled text,
+    non-empty lists) and store them as read-only mappings.
+    """
+    frozen = []
+    for i, tc in enumerate(testcases, start=1):
+        tc = {"Test_ID": f"TC_{i:03d}", **{k: v for k, v in tc.items() if k != "Test_ID"}}
+        for k in _TEXT_FIELDS:
+            if k in tc and (not tc[k] or str(tc[k]).strip() == ""):
+                tc[k] = f"{tc.get('Title','No Title')} - {k} auto-filled"
+        for k in _LIST_FIELDS:
+            tc[k] = tuple(s for s in tc.get(k, []) if str(s).strip())
+        frozen.append(MappingProxyType(tc))
+    return tuple(frozen)
+
+
+class RuleEngine:
+    """
+    Precompiled keyword rules for the deterministic fallback generators.
+    Feature test cases and step->Selenium snippets are loaded from config
+    once. Features and step keywords each compile into a single matcher
+    that scans the text once; rules are resolved in config order.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        features = config.get("features", [])
+        # feature: any of its patterns may appear in the query; feature patterns
+        # do not nest inside each other, so a plain (non-overlapping) scan suffices
+        self._feature_re = _compile_alternation(["|".join(f["patterns"]) for f in features])
+        self._feature_index = {f"k{i}": i for i in range(len(features))}
+        self._feature_cases = tuple(_freeze_testcases(f["testcases"]) for f in features)
+        self._default_cases = _freeze_testcases(config.get("default_testcases", []))
+
+        # step action: all of its keywords must appear, in any order
+        keywords = {}
+        self._step_actions = []
+        for action in config.get("step_actions", []):
+            ids = frozenset(keywords.setdefault(k, f"k{len(keywords)}") for k in action["keywords"])
+            self._step_actions.append((ids, tuple("    " + line for line in action["lines"])))
+        self._step_re = _compile_alternation(list(keywords), overlapping=True)
+
+        # steps repeat across templates, so memoize per engine; the bounded
+        # cache wraps _match_step and is exposed under the public name
+        self.step_lines = lru_cache(maxsize=4096)(self._match_step)
+
+    def testcases_for(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Return fresh, caller-owned copies of the test cases for the query.
+        The earliest configured feature found anywhere in the query wins.
+        """
+        best = None
+        for m in self._feature_re.finditer(query.lower()):
+            i = self._feature_index[m.lastgroup]
+            if best is None or i < best:
+                best = i
+                if i == 0:
+                    break
+        cases = self._default_cases if best is None else self._feature_cases[best]
+        copies = []
+        for tc in cases:
+            tc = tc.copy()
+            for k in _LIST_FIELDS:
+                tc[k] = list(tc[k])
+            copies.append(tc)
+        return copies
+
+    def _match_step(self, step: str) -> Optional[Tuple[str, ...]]:
+        """
+        Return the indented script lines for the first action whose keywords
+        all appear in the step, or None if no action applies.
+        """
+        found = {m.lastgroup for m in self._step_re.finditer(step.lower())}
+        for ids, lines in self._step_actions:
+            if ids <= found:
+                return lines
+        return None
+
+
+@lru_cache(maxsize=None)
+def load_rules(path: str = str(RULES_PATH)) -> RuleEngine:
+    """
+    Load and compile the rules file once per path.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return RuleEngine(json.load(f))